@@ -39,6 +39,9 @@ class ModelBasedAgentDFS:
     Agente baseado no fluxo de exploração DFS (Busca em Profundidade).
     Mantém uma pilha de visitados e uma lista de células fechadas.
     """
+    # Contadores de instrumentação, desligados por padrão (ver Ferramentas/instrumentacao.py).
+    contar = False
+
     def __init__(self, initial_position, grid):
         self.position = initial_position
         self.grid = grid
@@ -47,6 +50,7 @@ class ModelBasedAgentDFS:
         self.visited_set = {initial_position} 
         self.steps = 0
         self.redundant_steps = 0
+        self.contadores = {'expansoes': 0, 'vizinhos': 0}
 
     def neighbors(self, pos):
         """Retorna os vizinhos válidos de uma posição."""
@@ -67,6 +71,9 @@ class ModelBasedAgentDFS:
         """
         current = self.position
         neighbors = self.neighbors(current)
+        if self.contar:
+            self.contadores['expansoes'] += 1
+            self.contadores['vizinhos'] += len(neighbors)
 
         unvisited = [p for p in neighbors.values() if p not in self.visited_set]
 
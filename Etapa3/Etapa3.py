@@ -14,6 +14,25 @@ def generate_initial_position(grid_size, obstacles):
         if pos not in obstacles:
             return pos
 
+def is_position(value):
+    """Verifica se o valor é uma posição (x, y) com coordenadas inteiras."""
+    return isinstance(value, tuple) and len(value) == 2 and all(isinstance(v, int) for v in value)
+
+def as_goal_set(goal_position):
+    """
+    Aceita um objetivo (x, y) ou uma coleção de objetivos (x, y) e retorna um
+    conjunto. Qualquer outra coisa (ex.: [2, 2]) é ambígua e gera ValueError.
+    """
+    if is_position(goal_position):
+        return {goal_position}
+    try:
+        goals = set(goal_position)
+    except TypeError:
+        goals = set()
+    if not goals or not all(is_position(goal) for goal in goals):
+        raise ValueError(f"Objetivo inválido: {goal_position!r}. Use (x, y) ou uma coleção de (x, y).")
+    return goals
+
 class GridWorld:
     def __init__(self, n=8, obstacles=None):
         self.n = n
@@ -50,16 +69,23 @@ class GridWorld:
 class ModelBasedAgent_BFS_Goal:
     """
     Agente que usa Busca em Largura (BFS) para encontrar o caminho mais curto.
+    Com um conjunto de objetivos, para no mais próximo deles (goal_position
+    passa a ser o objetivo alcançado).
     """
+    # Contadores de instrumentação, desligados por padrão (ver Ferramentas/instrumentacao.py).
+    contar = False
+
     def __init__(self, initial_position, goal_position, grid):
         self.position = initial_position
-        self.goal_position = goal_position
+        self.goal_positions = as_goal_set(goal_position)
+        self.goal_position = goal_position if is_position(goal_position) else None
         self.grid = grid
         self.queue = deque([initial_position]) 
         self.visited_set = {initial_position} 
         self.parents = {initial_position: None}
         self.steps = 0
         self.path_found = []
+        self.contadores = {'expansoes': 0, 'fila_push': 1, 'fila_pop': 0, 'vizinhos': 0}
 
     def neighbors(self, pos):
         """Retorna os vizinhos válidos de uma posição."""
@@ -78,10 +104,13 @@ class ModelBasedAgent_BFS_Goal:
         current = self.queue.popleft() 
         self.position = current
         self.steps += 1
+        if self.contar:
+            self.contadores['fila_pop'] += 1
         
         print(f"Avançando para {current}")
         
-        if current == self.goal_position:
+        if current in self.goal_positions:
+            self.goal_position = current
             self.reconstruct_path(current)
             print("Objetivo alcançado!")
             return False
@@ -93,6 +122,12 @@ class ModelBasedAgent_BFS_Goal:
                 self.queue.append(next_pos)
                 self.parents[next_pos] = current
 
+        if self.contar:
+            self.contadores['expansoes'] += 1
+            self.contadores['vizinhos'] += len(neighbors)
+            # Toda posição entra na fila ao ser marcada como visitada.
+            self.contadores['fila_push'] = len(self.visited_set)
+
         return True
 
     def reconstruct_path(self, current):
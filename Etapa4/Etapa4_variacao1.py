@@ -15,6 +15,25 @@ def generate_initial_position(grid_size, obstacles):
         if pos not in obstacles:
             return pos
 
+def is_position(value):
+    """Verifica se o valor é uma posição (x, y) com coordenadas inteiras."""
+    return isinstance(value, tuple) and len(value) == 2 and all(isinstance(v, int) for v in value)
+
+def as_goal_set(goal_position):
+    """
+    Aceita um objetivo (x, y) ou uma coleção de objetivos (x, y) e retorna um
+    conjunto. Qualquer outra coisa (ex.: [2, 2]) é ambígua e gera ValueError.
+    """
+    if is_position(goal_position):
+        return {goal_position}
+    try:
+        goals = set(goal_position)
+    except TypeError:
+        goals = set()
+    if not goals or not all(is_position(goal) for goal in goals):
+        raise ValueError(f"Objetivo inválido: {goal_position!r}. Use (x, y) ou uma coleção de (x, y).")
+    return goals
+
 class GridWorldWithCosts:
     def __init__(self, n=8, obstacles=None):
         self.n = n
@@ -70,10 +89,16 @@ class GridWorldWithCosts:
         print("Legenda: 1 = Normal (C:1), 2 = Arenoso (C:2), 3 = Rochoso (C:3), # = Obstáculo, X = Agente, G = Destino, * = Caminho")
 
 class DijkstraAgent:
+    """
+    Agente que planeja o caminho de menor custo com Dijkstra. Com um conjunto
+    de objetivos, uma única busca encontra o de menor custo (goal_position
+    passa a ser o objetivo alcançado).
+    """
     def __init__(self, initial_position, goal_position, grid):
         self.initial_position = initial_position
         self.position = initial_position
-        self.goal_position = goal_position
+        self.goal_positions = as_goal_set(goal_position)
+        self.goal_position = goal_position if is_position(goal_position) else None
         self.grid = grid
         self.path = []
         self.total_cost = 0
@@ -81,6 +106,7 @@ class DijkstraAgent:
         self.visited = set()
         self.parents = {}
         self.found_goal = False
+        self.contadores = {}
 
         self.find_path_dijkstra()
 
@@ -98,24 +124,42 @@ class DijkstraAgent:
 
         costs = {self.initial_position: 0}
 
+        # Contadores em variáveis locais: custo desprezível no laço principal.
+        expansoes = pops = descartados = vizinhos = 0
+        pushes = 1
+
         while pq:
             current_cost, current_pos = heapq.heappop(pq)
+            pops += 1
             self.visited.add(current_pos)
 
-            if current_pos == self.goal_position:
+            if current_pos in self.goal_positions:
+                self.goal_position = current_pos
                 self.found_goal = True
                 break
 
             if current_cost > costs.get(current_pos, float('inf')):
+                descartados += 1
                 continue
 
+            expansoes += 1
             for next_pos in self.neighbors(current_pos):
+                vizinhos += 1
                 new_cost = current_cost + self.grid.get_cost(next_pos)
                 
                 if new_cost < costs.get(next_pos, float('inf')):
                     costs[next_pos] = new_cost
                     self.parents[next_pos] = current_pos
                     heapq.heappush(pq, (new_cost, next_pos))
+                    pushes += 1
+
+        self.contadores = {
+            'expansoes': expansoes,
+            'heap_push': pushes,
+            'heap_pop': pops,
+            'descartados': descartados,
+            'vizinhos': vizinhos,
+        }
 
         if self.found_goal:
             self.reconstruct_path()
@@ -154,6 +198,68 @@ class DijkstraAgent:
             print("Fim do caminho pré-calculado.")
             return False
 
+def multi_source_dijkstra(grid, sources, targets=None, reverse=False):
+    """
+    Dijkstra partindo de várias origens ao mesmo tempo (todas com custo 0).
+    Origens que não são células livres são ignoradas. Com `targets`, para assim
+    que todos eles forem fechados; sem, percorre tudo o que for alcançável.
+
+    No modo normal o custo de ir de u para v é o custo de entrar em v, como no
+    DijkstraAgent. No modo reverso calcula o custo de cada célula até a origem
+    mais próxima: ao relaxar um vizinho u a partir de v soma-se o custo de
+    entrar em v, e parents[u] passa a ser o próximo passo de u rumo à origem.
+    Retorna os custos finais e o dicionário de pais.
+    """
+    costs = {}
+    parents = {}
+    for source in sources:
+        if grid.is_free(source):
+            costs[source] = 0
+            parents[source] = None
+    pq = [(0, source) for source in costs]
+    heapq.heapify(pq)
+    pending = set(targets) if targets is not None else None
+
+    while pq and (pending is None or pending):
+        current_cost, current_pos = heapq.heappop(pq)
+        if current_cost > costs[current_pos]:
+            continue
+        if pending is not None:
+            pending.discard(current_pos)
+            if not pending:
+                break
+
+        enter_cost = grid.get_cost(current_pos)
+        x, y = current_pos
+        for next_pos in [(x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)]:
+            if not grid.is_free(next_pos):
+                continue
+            new_cost = current_cost + (enter_cost if reverse else grid.get_cost(next_pos))
+            if new_cost < costs.get(next_pos, float('inf')):
+                costs[next_pos] = new_cost
+                parents[next_pos] = current_pos
+                heapq.heappush(pq, (new_cost, next_pos))
+
+    return costs, parents
+
+def nearest_goal_costs(grid, goal_positions):
+    """
+    Dijkstra reverso partindo de todos os objetivos ao mesmo tempo. Em uma única
+    busca calcula, para cada célula alcançável, o custo até o objetivo mais
+    próximo e o próximo passo nessa direção.
+    """
+    return multi_source_dijkstra(grid, as_goal_set(goal_positions), reverse=True)
+
+def path_to_nearest_goal(next_step, position):
+    """Segue o mapa de próximos passos de nearest_goal_costs até o objetivo mais próximo."""
+    if position not in next_step:
+        return []
+    path = []
+    while position is not None:
+        path.append(position)
+        position = next_step[position]
+    return path
+
 if __name__ == "__main__":
     grid_size = 8
     num_obstacles = 10
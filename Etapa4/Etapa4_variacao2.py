@@ -70,6 +70,9 @@ class GridWorldWithCosts:
         print("Legenda: 1 = Normal (C:1), 2 = Arenoso (C:2), 3 = Rochoso (C:3), # = Obstáculo, X = Agente, G = Destino, * = Caminho")
 
 class UtilityAgent:
+    # Contadores de instrumentação, desligados por padrão (ver Ferramentas/instrumentacao.py).
+    contar = False
+
     def __init__(self, initial_position, goal_position, grid):
         self.position = initial_position
         self.goal_position = goal_position
@@ -79,6 +82,7 @@ class UtilityAgent:
         self.total_cost = 0
         self.steps = 0
         self.found_goal = False
+        self.contadores = {'expansoes': 0, 'vizinhos': 0}
 
     def neighbors(self, pos):
         """Retorna os vizinhos válidos de uma posição."""
@@ -102,6 +106,9 @@ class UtilityAgent:
             return False
 
         valid_neighbors = self.neighbors(self.position)
+        if self.contar:
+            self.contadores['expansoes'] += 1
+            self.contadores['vizinhos'] += len(valid_neighbors)
         
         unvisited_neighbors = [n for n in valid_neighbors if n not in self.visited]
         
@@ -0,0 +1,363 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+import platform
+import tracemalloc
+import contextlib
+from collections import deque
+
+from etapas import carregar_etapa
+
+TAMANHOS = (8, 16, 32)
+DENSIDADES = (0.0, 0.1, 0.25)
+SEMENTES = (1, 2, 3)
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+ARQUIVO_RESULTADOS = os.path.join(DIRETORIO, 'resultados.json')
+ARQUIVO_BASELINE = os.path.join(DIRETORIO, 'baseline.json')
+
+class Cenario:
+    """
+    Cenário fixo (reprodutível) de benchmark: tamanho do grid, densidade de
+    obstáculos e semente usada para sortear obstáculos, início e objetivo.
+    """
+    def __init__(self, n, densidade, semente):
+        self.n = n
+        self.densidade = densidade
+        self.semente = semente
+
+        etapa3 = carregar_etapa('etapa3')
+        random.seed(semente)
+        self.obstacles = etapa3.generate_obstacles(n, int(n * n * densidade))
+        while True:
+            self.initial_pos = etapa3.generate_initial_position(n, self.obstacles)
+            self.goal_pos = etapa3.generate_initial_position(n, self.obstacles)
+            if self.initial_pos != self.goal_pos:
+                break
+
+    def chave(self):
+        return f"{self.n}x{self.n}/d={self.densidade}/s={self.semente}"
+
+    def mundo_com_custos(self, modulo):
+        """Cria o GridWorldWithCosts do módulo com terreno sorteado pela semente do cenário."""
+        random.seed(self.semente)
+        return modulo.GridWorldWithCosts(self.n, set(self.obstacles))
+
+def preparar_reativo(cenario):
+    return carregar_etapa('etapa1').GridWorld(cenario.n)
+
+def executar_reativo(cenario, world, contar=False):
+    etapa1 = carregar_etapa('etapa1')
+    robot = etapa1.SequentialReactiveAgent(cenario.initial_pos, world)
+    # Se o robô já começa encostado na parede da direção atual ele a atravessa
+    # sem detectar a colisão; limita o número de passos para não travar.
+    max_steps = 4 * cenario.n
+    steps = 0
+    while steps < max_steps and not robot.act():
+        steps += 1
+    return {
+        'sucesso': len(robot.walls_collided) == 4,
+        'comprimento': steps,
+        'custo': steps,
+        'expansoes': steps,
+    }
+
+def preparar_dfs(cenario):
+    return carregar_etapa('etapa2').GridWorld(cenario.n, set(cenario.obstacles))
+
+def executar_dfs(cenario, world, contar=False):
+    etapa2 = carregar_etapa('etapa2')
+    robot = etapa2.ModelBasedAgentDFS(cenario.initial_pos, world)
+    robot.contar = contar
+    while robot.act():
+        pass
+    total_cells = cenario.n * cenario.n - len(cenario.obstacles)
+    return {
+        'sucesso': len(robot.visited_set) == total_cells,
+        'comprimento': robot.steps,
+        'custo': robot.steps,
+        'expansoes': len(robot.visited_set),
+        'contadores': dict(robot.contadores),
+    }
+
+def preparar_bfs(cenario):
+    return carregar_etapa('etapa3').GridWorld(cenario.n, set(cenario.obstacles))
+
+def executar_bfs(cenario, world, contar=False):
+    etapa3 = carregar_etapa('etapa3')
+    robot = etapa3.ModelBasedAgent_BFS_Goal(cenario.initial_pos, cenario.goal_pos, world)
+    robot.contar = contar
+    while robot.act():
+        pass
+    return {
+        'sucesso': bool(robot.path_found),
+        'comprimento': len(robot.path_found),
+        'custo': max(len(robot.path_found) - 1, 0),
+        'expansoes': robot.steps,
+        'contadores': dict(robot.contadores),
+    }
+
+def preparar_dijkstra(cenario):
+    return cenario.mundo_com_custos(carregar_etapa('etapa4_variacao1'))
+
+def executar_dijkstra(cenario, world, contar=False):
+    etapa4 = carregar_etapa('etapa4_variacao1')
+    robot = etapa4.DijkstraAgent(cenario.initial_pos, cenario.goal_pos, world)
+    while robot.act():
+        pass
+    return {
+        'sucesso': robot.found_goal,
+        'comprimento': len(robot.path),
+        'custo': robot.total_cost,
+        'expansoes': len(robot.visited),
+        'contadores': dict(robot.contadores),
+    }
+
+def preparar_utilidade(cenario):
+    return cenario.mundo_com_custos(carregar_etapa('etapa4_variacao2'))
+
+def executar_utilidade(cenario, world, contar=False):
+    etapa4 = carregar_etapa('etapa4_variacao2')
+    robot = etapa4.UtilityAgent(cenario.initial_pos, cenario.goal_pos, world)
+    robot.contar = contar
+    # O agente guloso pode ficar andando em círculos; limita o número de passos.
+    max_steps = 4 * cenario.n * cenario.n
+    while robot.steps < max_steps and robot.act():
+        pass
+    return {
+        'sucesso': robot.found_goal,
+        'comprimento': len(robot.path),
+        'custo': robot.total_cost,
+        'expansoes': robot.steps,
+        'contadores': dict(robot.contadores),
+    }
+
+# Para cada agente: (montagem do mundo, fora da medição; execução medida).
+AGENTES = {
+    'SequentialReactiveAgent': (preparar_reativo, executar_reativo),
+    'ModelBasedAgentDFS': (preparar_dfs, executar_dfs),
+    'ModelBasedAgent_BFS_Goal': (preparar_bfs, executar_bfs),
+    'DijkstraAgent': (preparar_dijkstra, executar_dijkstra),
+    'UtilityAgent': (preparar_utilidade, executar_utilidade),
+}
+
+# Medidas que variam entre execuções e por isso são confirmadas antes de
+# serem apontadas como regressão.
+MEDIDAS_RUIDOSAS = ('tempo_relativo', 'memoria_pico_bytes')
+
+def custo_otimo(cenario):
+    """Custo do caminho ótimo no mundo com custos do cenário (referência de qualidade)."""
+    etapa4 = carregar_etapa('etapa4_variacao1')
+    world = cenario.mundo_com_custos(etapa4)
+    with silenciar():
+        robot = etapa4.DijkstraAgent(cenario.initial_pos, cenario.goal_pos, world)
+    return robot.total_cost if robot.found_goal else None
+
+@contextlib.contextmanager
+def silenciar():
+    """Descarta os prints dos agentes durante a medição."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+def carga_referencia(n=32):
+    """
+    Trabalho fixo (BFS num grid vazio) usado como régua: a velocidade desta
+    máquina varia entre execuções, então cada medição é feita junto com esta
+    carga e o tempo do agente é guardado também em relação a ela.
+    """
+    queue = deque([(0, 0)])
+    visited = {(0, 0)}
+    while queue:
+        x, y = queue.popleft()
+        for p in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+            if 0 <= p[0] < n and 0 <= p[1] < n and p not in visited:
+                visited.add(p)
+                queue.append(p)
+
+def mediana_e_iqr(valores):
+    if len(valores) == 1:
+        return valores[0], 0.0
+    q1, q2, q3 = statistics.quantiles(valores, n=4)
+    return q2, q3 - q1
+
+def medir(agente, cenario, repeticoes):
+    """
+    Mede o tempo de parede da execução do agente (busca e laço de act, sem a
+    montagem do mundo). Cada repetição roda antes a carga de referência; o
+    resultado guarda a mediana do tempo e a mediana da razão agente/referência
+    (tempo_relativo), que é a usada na comparação com a baseline.
+    Em uma execução separada mede o pico de memória alocada com tracemalloc.
+    """
+    preparar, executar = agente
+    world = preparar(cenario)
+    tempos = []
+    razoes = []
+    with silenciar():
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            carga_referencia()
+            meio = time.perf_counter()
+            resultado = executar(cenario, world)
+            fim = time.perf_counter()
+            tempos.append(fim - meio)
+            razoes.append((fim - meio) / (meio - inicio))
+
+        # A execução de memória também coleta os contadores dos agentes, que
+        # ficam desligados nas repetições cronometradas.
+        tracemalloc.start()
+        try:
+            contado = executar(cenario, world, contar=True)
+            _, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    resultado['tempo_s'], _ = mediana_e_iqr(tempos)
+    resultado['tempo_relativo'], resultado['tempo_relativo_iqr'] = mediana_e_iqr(razoes)
+    resultado['memoria_pico_bytes'] = pico
+    if 'contadores' in contado:
+        resultado['contadores'] = contado['contadores']
+    return resultado
+
+def rodar_benchmark(agentes, tamanhos, densidades, sementes, repeticoes):
+    resultados = []
+    for n in tamanhos:
+        for densidade in densidades:
+            for semente in sementes:
+                cenario = Cenario(n, densidade, semente)
+                otimo = custo_otimo(cenario)
+                for nome in agentes:
+                    resultado = medir(AGENTES[nome], cenario, repeticoes)
+                    resultado['agente'] = nome
+                    resultado['cenario'] = cenario.chave()
+                    resultado['n'] = n
+                    resultado['densidade'] = densidade
+                    resultado['semente'] = semente
+                    if nome in ('DijkstraAgent', 'UtilityAgent') and otimo and resultado['sucesso']:
+                        resultado['razao_custo_otimo'] = resultado['custo'] / otimo
+                    else:
+                        resultado['razao_custo_otimo'] = None
+                    resultados.append(resultado)
+                    print(f"{nome:<26} {cenario.chave():<22} "
+                          f"{resultado['tempo_s'] * 1000:9.3f} ms  "
+                          f"{resultado['expansoes']:6d} exp  "
+                          f"{resultado['memoria_pico_bytes'] / 1024:9.1f} KiB")
+    return {
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'repeticoes': repeticoes,
+        'resultados': resultados,
+    }
+
+def piorou(r, b, campo, tolerancia, piso_relativo=0.05, piso_memoria_bytes=4096):
+    """
+    Diz se uma medida ruidosa piorou: precisa passar da tolerância relativa e
+    de um piso absoluto. Para o tempo, o piso cresce com a dispersão (intervalo
+    interquartil) das duas medições, acompanhando o ruído de cada cenário.
+    """
+    if campo == 'tempo_relativo':
+        piso = max(piso_relativo * b[campo], 3 * (r['tempo_relativo_iqr'] + b['tempo_relativo_iqr']))
+    else:
+        piso = piso_memoria_bytes
+    return r[campo] > b[campo] * (1 + tolerancia) and r[campo] - b[campo] > piso
+
+def comparar(atual, baseline, tolerancia):
+    """
+    Compara os resultados com a baseline e retorna a lista de regressões.
+    Expansões, comprimento, custo e sucesso são determinísticos: qualquer piora
+    é regressão. Tempo e memória seguem o critério de piorou().
+    """
+    base = {(r['agente'], r['cenario']): r for r in baseline['resultados']}
+    regressoes = []
+    for r in atual['resultados']:
+        b = base.get((r['agente'], r['cenario']))
+        if b is None:
+            continue
+
+        def regressao(campo, antes, depois):
+            regressoes.append({'agente': r['agente'], 'cenario': r['cenario'], 'campo': campo,
+                               'antes': antes, 'depois': depois, 'resultado': r, 'base': b})
+
+        for campo in MEDIDAS_RUIDOSAS:
+            if piorou(r, b, campo, tolerancia):
+                regressao(campo, b[campo], r[campo])
+
+        for campo in ('expansoes', 'comprimento', 'custo'):
+            if r[campo] > b[campo]:
+                regressao(campo, b[campo], r[campo])
+
+        if b['sucesso'] and not r['sucesso']:
+            regressao('sucesso', True, False)
+    return regressoes
+
+def confirmar(regressoes, tolerancia, repeticoes, confirmacoes):
+    """
+    Mede de novo os cenários com regressão de tempo ou memória e só mantém as
+    que se repetem em todas as `confirmacoes` medições.
+    """
+    confirmadas = []
+    for regressao in regressoes:
+        if regressao['campo'] not in MEDIDAS_RUIDOSAS:
+            confirmadas.append(regressao)
+            continue
+        r = regressao['resultado']
+        cenario = Cenario(r['n'], r['densidade'], r['semente'])
+        for _ in range(confirmacoes):
+            novo = medir(AGENTES[r['agente']], cenario, repeticoes)
+            if not piorou(novo, regressao['base'], regressao['campo'], tolerancia):
+                break
+        else:
+            confirmadas.append(regressao)
+    return confirmadas
+
+def inteiro_positivo(texto):
+    """Tipo do argparse para opções que precisam ser >= 1."""
+    valor = int(texto)
+    if valor < 1:
+        raise argparse.ArgumentTypeError(f"precisa ser pelo menos 1, recebido {valor}")
+    return valor
+
+def salvar(dados, caminho):
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, indent=2, ensure_ascii=False)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dos agentes e planejadores.")
+    parser.add_argument('--agentes', nargs='+', choices=list(AGENTES), default=list(AGENTES))
+    parser.add_argument('--tamanhos', nargs='+', type=int, default=list(TAMANHOS))
+    parser.add_argument('--densidades', nargs='+', type=float, default=list(DENSIDADES))
+    parser.add_argument('--sementes', nargs='+', type=int, default=list(SEMENTES))
+    parser.add_argument('--repeticoes', type=inteiro_positivo, default=15)
+    parser.add_argument('--saida', default=ARQUIVO_RESULTADOS)
+    parser.add_argument('--baseline', default=ARQUIVO_BASELINE)
+    parser.add_argument('--salvar-baseline', action='store_true',
+                        help="grava os resultados como nova baseline")
+    parser.add_argument('--tolerancia', type=float, default=0.25,
+                        help="piora relativa aceita em tempo e memória (padrão: 25%%)")
+    parser.add_argument('--confirmacoes', type=int, default=2,
+                        help="novas medições que uma regressão de tempo/memória precisa repetir")
+    args = parser.parse_args()
+
+    atual = rodar_benchmark(args.agentes, args.tamanhos, args.densidades, args.sementes, args.repeticoes)
+    salvar(atual, args.saida)
+    print(f"\nResultados salvos em {args.saida}")
+
+    if args.salvar_baseline:
+        salvar(atual, args.baseline)
+        print(f"Baseline salva em {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressoes = comparar(atual, baseline, args.tolerancia)
+        regressoes = confirmar(regressoes, args.tolerancia, args.repeticoes, args.confirmacoes)
+        print("\n=== REGRESSÕES ===")
+        if regressoes:
+            for r in regressoes:
+                print(f"{r['agente']} {r['cenario']}: {r['campo']} {r['antes']} -> {r['depois']}")
+            sys.exit(1)
+        print("Nenhuma regressão em relação à baseline.")
+    else:
+        print("Nenhuma baseline encontrada; use --salvar-baseline para criar uma.")
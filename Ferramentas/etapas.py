@@ -0,0 +1,28 @@
+import os
+import sys
+import importlib.util
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ETAPAS = {
+    'etapa1': os.path.join('Etapa1', 'Etapa1.py'),
+    'etapa2': os.path.join('Etapa2', 'Etapa2.py'),
+    'etapa3': os.path.join('Etapa3', 'Etapa3.py'),
+    'etapa4_variacao1': os.path.join('Etapa4', 'Etapa4_variacao1.py'),
+    'etapa4_variacao2': os.path.join('Etapa4', 'Etapa4_variacao2.py'),
+}
+
+def carregar_etapa(nome):
+    """
+    Importa o script de uma etapa como módulo (sem executar o bloco __main__).
+    O módulo é registrado em sys.modules para que seus objetos possam ser
+    serializados com pickle.
+    """
+    if nome in sys.modules:
+        return sys.modules[nome]
+    caminho = os.path.join(RAIZ, ETAPAS[nome])
+    spec = importlib.util.spec_from_file_location(nome, caminho)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nome] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
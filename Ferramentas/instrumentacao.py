@@ -0,0 +1,162 @@
+import time
+import random
+import functools
+import threading
+import contextlib
+from collections import Counter
+
+from etapas import carregar_etapa
+
+# Fase associada a cada método instrumentado por padrão.
+FASES = {
+    'find_path_dijkstra': 'busca',
+    'act': 'passo',
+    'print_grid': 'render',
+}
+
+class Instrumentacao:
+    """
+    Coleta contadores e tempos por fase (spans) das execuções dos agentes.
+
+    Os agentes não dependem deste módulo: os contadores ficam em
+    `agente.contadores` e só são atualizados com o atributo de classe `contar`
+    ligado; os spans são adicionados trocando os métodos das classes. As duas
+    coisas valem apenas dentro de `instrumentar()`. Fora dele, nada é medido.
+
+    A troca de métodos vale para o processo inteiro, então chamadas feitas por
+    outras threads durante `instrumentar()` também são medidas. Cada thread
+    tem a sua própria pilha de spans e a agregação é protegida por uma trava.
+    """
+    def __init__(self):
+        self.contadores = Counter()
+        self.spans = {}
+        self.pilhas = Counter()
+        self._local = threading.local()
+        self._trava = threading.Lock()
+
+    def _pilha(self):
+        if not hasattr(self._local, 'pilha'):
+            self._local.pilha = []
+        return self._local.pilha
+
+    def contar(self, nome, quantidade=1):
+        with self._trava:
+            self.contadores[nome] += quantidade
+
+    def coletar(self, agente):
+        """Soma os contadores acumulados por um agente."""
+        with self._trava:
+            self.contadores.update(getattr(agente, 'contadores', {}))
+
+    @contextlib.contextmanager
+    def span(self, nome):
+        """Mede o tempo de um trecho; spans aninhados formam uma pilha (ex.: passo;render)."""
+        pilhas = self._pilha()
+        pilhas.append(nome)
+        pilha = ';'.join(pilhas)
+        inicio = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            duracao = time.perf_counter_ns() - inicio
+            pilhas.pop()
+            with self._trava:
+                chamadas, total, maximo = self.spans.get(nome, (0, 0, 0))
+                self.spans[nome] = (chamadas + 1, total + duracao, max(maximo, duracao))
+                # Tempo exclusivo da pilha: desconta o tempo já atribuído aos filhos.
+                self.pilhas[pilha] += duracao
+                if pilhas:
+                    self.pilhas[';'.join(pilhas)] -= duracao
+
+    def _envolver(self, metodo, nome):
+        @functools.wraps(metodo)
+        def envolvido(*args, **kwargs):
+            with self.span(nome):
+                return metodo(*args, **kwargs)
+        return envolvido
+
+    @contextlib.contextmanager
+    def instrumentar(self, *classes, fases=FASES):
+        """
+        Envolve os métodos das classes listados em `fases` com spans, liga os
+        contadores das classes que os têm e restaura tudo ao sair do bloco.
+        """
+        originais = []
+        for classe in classes:
+            if 'contar' in vars(classe):
+                originais.append((classe, 'contar', vars(classe)['contar']))
+                classe.contar = True
+            for metodo, nome in fases.items():
+                if metodo in vars(classe):
+                    original = vars(classe)[metodo]
+                    originais.append((classe, metodo, original))
+                    setattr(classe, metodo, self._envolver(original, nome))
+        try:
+            yield self
+        finally:
+            for classe, metodo, original in reversed(originais):
+                setattr(classe, metodo, original)
+
+    def como_dict(self):
+        """Exporta as métricas em um dicionário (tempos em segundos)."""
+        return {
+            'contadores': dict(self.contadores),
+            'spans': {
+                nome: {
+                    'chamadas': chamadas,
+                    'total_s': total / 1e9,
+                    'media_s': total / chamadas / 1e9,
+                    'max_s': maximo / 1e9,
+                }
+                for nome, (chamadas, total, maximo) in self.spans.items()
+            },
+        }
+
+    def exportar_pilhas(self, caminho):
+        """
+        Grava os tempos no formato de pilhas colapsadas ("folded stacks"), o mesmo
+        gerado por profilers por amostragem como o py-spy, podendo ser aberto no
+        speedscope ou no flamegraph.pl. Cada linha é "fase;subfase microssegundos".
+        """
+        with open(caminho, 'w', encoding='utf-8') as f:
+            for pilha, duracao in sorted(self.pilhas.items()):
+                if duracao > 0:
+                    f.write(f"{pilha} {duracao // 1000}\n")
+
+if __name__ == "__main__":
+    import os
+    import json
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Exemplo de instrumentação do DijkstraAgent.")
+    parser.add_argument('--pilhas', metavar='CAMINHO',
+                        help="grava os tempos em pilhas colapsadas neste arquivo")
+    args = parser.parse_args()
+
+    grid_size = 32
+    num_obstacles = 150
+
+    etapa4 = carregar_etapa('etapa4_variacao1')
+
+    random.seed(0)
+    obstacles = etapa4.generate_obstacles(grid_size, num_obstacles)
+    while True:
+        initial_pos = etapa4.generate_initial_position(grid_size, obstacles)
+        goal_pos = etapa4.generate_initial_position(grid_size, obstacles)
+        if initial_pos != goal_pos:
+            break
+    world = etapa4.GridWorldWithCosts(grid_size, obstacles)
+
+    inst = Instrumentacao()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        with inst.instrumentar(etapa4.DijkstraAgent, etapa4.GridWorldWithCosts):
+            robot = etapa4.DijkstraAgent(initial_pos, goal_pos, world)
+            while robot.act():
+                world.print_grid(robot.position, robot.visited, set(), goal_pos, robot.path)
+    inst.coletar(robot)
+
+    print("=== MÉTRICAS DE INSTRUMENTAÇÃO ===")
+    print(json.dumps(inst.como_dict(), indent=2))
+    if args.pilhas:
+        inst.exportar_pilhas(args.pilhas)
+        print(f"Pilhas colapsadas salvas em {args.pilhas}")
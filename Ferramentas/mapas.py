@@ -0,0 +1,263 @@
+import os
+import ast
+import mmap
+import time
+import struct
+import sys
+import tempfile
+
+from etapas import carregar_etapa
+
+# Custo de cada caractere do formato .map do MovingAI (0 = intransponível).
+# '.' e 'G' são chão, 'S' é pântano (transitável); '@', 'O', 'T' e 'W' bloqueiam.
+CUSTOS_MOVINGAI = [0] * 256
+for _caractere in b'.GS':
+    CUSTOS_MOVINGAI[_caractere] = 1
+
+# Tipos do NumPy (campo 'descr' do cabeçalho .npy) aceitos, com o formato do struct.
+TIPOS_NPY = {
+    '|u1': 'B',
+    '<u2': 'H',
+    '<u4': 'I',
+    '<i4': 'i',
+    '<f4': 'f',
+    '<f8': 'd',
+}
+
+class GridWorldMapeado:
+    """
+    Mundo em grid lido de um arquivo mapeado em memória (mmap somente leitura).
+
+    As células não viram objetos Python: `is_free` e `get_cost` leem o valor
+    direto do arquivo, então abrir o mapa custa só a leitura do cabeçalho e o
+    sistema operacional carrega as páginas sob demanda. Tem a mesma interface
+    usada pelos agentes em GridWorldWithCosts.
+
+    A linha 0 do arquivo é o topo do mapa, então ela corresponde a y = altura - 1
+    (o norte fica em y + 1, como nos outros grids).
+    """
+    def __init__(self, caminho, largura, altura, tipo='B', deslocamento=0, passo=None,
+                 tabela=None, ordem_fortran=False):
+        self.caminho = caminho
+        self.largura = largura
+        self.altura = altura
+        self.tipo = tipo
+        self.deslocamento = deslocamento
+        self.passo = passo if passo is not None else largura
+        self.tabela = tabela
+        self.ordem_fortran = ordem_fortran
+        self._abrir()
+
+    def _abrir(self):
+        if sys.byteorder != 'little' and self.tipo != 'B':
+            raise ValueError("Rasters com mais de um byte por célula exigem uma máquina little-endian.")
+        tamanho_item = struct.calcsize(self.tipo)
+        if self.ordem_fortran:
+            num_itens = self.largura * self.altura
+        else:
+            num_itens = (self.altura - 1) * self.passo + self.largura
+        fim = self.deslocamento + num_itens * tamanho_item
+
+        with open(self.caminho, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < fim:
+            self._mmap.close()
+            raise ValueError(f"Arquivo {self.caminho} menor que o esperado para um mapa "
+                             f"{self.largura}x{self.altura}.")
+        self._celulas = memoryview(self._mmap)[self.deslocamento:fim].cast(self.tipo)
+
+    def fechar(self):
+        self._celulas.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def __getstate__(self):
+        # Só os parâmetros são serializados; cada processo reabre o arquivo e
+        # compartilha as mesmas páginas do cache do sistema operacional.
+        estado = self.__dict__.copy()
+        del estado['_mmap']
+        del estado['_celulas']
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._abrir()
+
+    def valor(self, position):
+        """Valor bruto da célula (após a tabela de custos, se houver)."""
+        x, y = position
+        linha = self.altura - 1 - y
+        if self.ordem_fortran:
+            valor = self._celulas[x * self.altura + linha]
+        else:
+            valor = self._celulas[linha * self.passo + x]
+        if self.tabela is not None:
+            valor = self.tabela[valor]
+        return valor
+
+    def is_free(self, position):
+        x, y = position
+        if not (0 <= x < self.largura and 0 <= y < self.altura):
+            return False
+        return 0 < self.valor(position) < float('inf')
+
+    def get_cost(self, position):
+        """Retorna o custo de movimento para uma posição."""
+        if not self.is_free(position):
+            return float('inf')
+        return self.valor(position)
+
+    def print_grid(self, robot_position, visited, closed, goal_position, path_found=None):
+        print("-" * (self.largura * 2 + 1))
+        for y in range(self.altura - 1, -1, -1):
+            row = "|"
+            for x in range(self.largura):
+                pos = (x, y)
+                if not self.is_free(pos):
+                    row += " #"
+                elif pos == robot_position:
+                    row += " X"
+                elif pos == goal_position:
+                    row += " G"
+                elif path_found and pos in path_found:
+                    row += " *"
+                else:
+                    row += f" {self.valor(pos):g}"
+            row += " |"
+            print(row)
+        print("-" * (self.largura * 2 + 1))
+
+def carregar_movingai(caminho):
+    """
+    Abre um mapa no formato .map do MovingAI:
+
+        type octile
+        height 4
+        width 4
+        map
+        ..@.
+        ...
+    """
+    cabecalho = {}
+    with open(caminho, 'rb') as f:
+        while True:
+            linha = f.readline()
+            if not linha:
+                raise ValueError(f"{caminho}: cabeçalho .map sem a linha 'map'.")
+            campos = linha.split()
+            if campos == [b'map']:
+                break
+            if len(campos) == 2:
+                cabecalho[campos[0].decode()] = campos[1].decode()
+        deslocamento = f.tell()
+        primeira_linha = f.readline()
+
+    largura = int(cabecalho['width'])
+    altura = int(cabecalho['height'])
+    conteudo = primeira_linha.rstrip(b'\r\n')
+    fim_de_linha = len(primeira_linha) - len(conteudo)
+    if len(conteudo) != largura:
+        raise ValueError(f"{caminho}: a primeira linha do mapa tem {len(conteudo)} células, "
+                         f"mas o cabeçalho declara width {largura}.")
+
+    # As células são lidas por deslocamento fixo, então todas as linhas precisam
+    # ter o mesmo tamanho. Confere isso pelo tamanho do arquivo (o terminador da
+    # última linha é opcional).
+    passo = largura + fim_de_linha
+    esperado = deslocamento + altura * passo
+    terminador = primeira_linha[len(conteudo):]
+    with open(caminho, 'rb') as f:
+        tamanho = f.seek(0, os.SEEK_END)
+        if tamanho == esperado and fim_de_linha:
+            f.seek(esperado - fim_de_linha)
+            final_ok = f.read(fim_de_linha) == terminador
+        else:
+            final_ok = tamanho == esperado - fim_de_linha
+    if not final_ok:
+        raise ValueError(f"{caminho}: tamanho incompatível com um mapa {largura}x{altura} "
+                         f"de linhas iguais (linhas irregulares ou height incorreto).")
+    return GridWorldMapeado(caminho, largura, altura, deslocamento=deslocamento,
+                            passo=passo, tabela=CUSTOS_MOVINGAI)
+
+def carregar_raster(caminho, largura, altura, tipo='B', deslocamento=0):
+    """
+    Abre um raster binário cru de custos, linha a linha a partir do topo.
+    `tipo` é um formato do módulo struct ('B' = uint8, 'f' = float32, ...).
+    Células com custo <= 0, infinito ou NaN são obstáculos.
+    """
+    return GridWorldMapeado(caminho, largura, altura, tipo=tipo, deslocamento=deslocamento)
+
+def carregar_npy(caminho):
+    """Abre um array 2D salvo com numpy.save (altura x largura) sem precisar do NumPy."""
+    with open(caminho, 'rb') as f:
+        magico = f.read(8)
+        if magico[:6] != b'\x93NUMPY':
+            raise ValueError(f"{caminho} não é um arquivo .npy.")
+        versao = magico[6]
+        if versao == 1:
+            (tamanho_cabecalho,) = struct.unpack('<H', f.read(2))
+        else:
+            (tamanho_cabecalho,) = struct.unpack('<I', f.read(4))
+        cabecalho = ast.literal_eval(f.read(tamanho_cabecalho).decode('latin1'))
+        deslocamento = f.tell()
+
+    if cabecalho['descr'] not in TIPOS_NPY:
+        raise ValueError(f"Tipo {cabecalho['descr']} não suportado; use um de {sorted(TIPOS_NPY)}.")
+    if len(cabecalho['shape']) != 2:
+        raise ValueError("O array .npy precisa ter duas dimensões (altura, largura).")
+    altura, largura = cabecalho['shape']
+    return GridWorldMapeado(caminho, largura, altura, tipo=TIPOS_NPY[cabecalho['descr']],
+                            deslocamento=deslocamento, ordem_fortran=cabecalho['fortran_order'])
+
+def carregar_mapa(caminho, **kwargs):
+    """Escolhe o carregador pela extensão do arquivo (.map, .npy ou raster cru)."""
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao == '.map':
+        return carregar_movingai(caminho)
+    if extensao == '.npy':
+        return carregar_npy(caminho)
+    return carregar_raster(caminho, **kwargs)
+
+if __name__ == "__main__":
+    grid_size = 256
+    num_obstacles = 10000
+
+    etapa4 = carregar_etapa('etapa4_variacao1')
+
+    obstacles = etapa4.generate_obstacles(grid_size, num_obstacles)
+    linhas = []
+    for y in range(grid_size - 1, -1, -1):
+        linhas.append(''.join('@' if (x, y) in obstacles else '.' for x in range(grid_size)))
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, 'exemplo.map')
+        with open(caminho, 'w') as f:
+            f.write(f"type octile\nheight {grid_size}\nwidth {grid_size}\nmap\n")
+            f.write('\n'.join(linhas) + '\n')
+
+        inicio = time.perf_counter()
+        world = carregar_mapa(caminho)
+        tempo_abertura = time.perf_counter() - inicio
+
+        while True:
+            initial_pos = etapa4.generate_initial_position(grid_size, obstacles)
+            goal_pos = etapa4.generate_initial_position(grid_size, obstacles)
+            if initial_pos != goal_pos:
+                break
+
+        inicio = time.perf_counter()
+        robot = etapa4.DijkstraAgent(initial_pos, goal_pos, world)
+        tempo_busca = time.perf_counter() - inicio
+
+        print("\n=== MÉTRICAS ===")
+        print(f"Mapa: {world.largura}x{world.altura} ({os.path.getsize(caminho)} bytes)")
+        print(f"Tempo de abertura: {tempo_abertura * 1000:.3f} ms")
+        print(f"Sucesso na Tarefa: {'Sim' if robot.found_goal else 'Não'}")
+        print(f"Custo Total do Caminho: {robot.total_cost}")
+        print(f"Tempo de busca: {tempo_busca * 1000:.3f} ms")
+        world.fechar()
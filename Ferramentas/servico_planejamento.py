@@ -0,0 +1,282 @@
+import os
+import math
+import time
+import random
+import asyncio
+import contextlib
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from etapas import carregar_etapa
+
+# Carregado na importação para que os processos trabalhadores consigam
+# desserializar o mundo (a classe precisa estar registrada em sys.modules);
+# a busca em lote usa o multi_source_dijkstra da Etapa 4.
+etapa4 = carregar_etapa('etapa4_variacao1')
+
+# Mundo compartilhado pelas buscas de cada processo trabalhador. Só é usado
+# pelo pool de processos; com threads o mundo é passado em cada chamada, já
+# que todas as threads (e serviços) do processo veriam a mesma variável.
+_mundo = None
+
+# Marca colocada na fila por encerrar() para o agrupador terminar.
+_FIM = object()
+
+def _inicializar(mundo):
+    global _mundo
+    _mundo = mundo
+
+def _resolver_lote(raiz, alvos, reverso, grid=None):
+    """
+    Resolve um lote de consultas que compartilham a origem (ou, no modo reverso,
+    o destino). Retorna {alvo: (custo, caminho)} com o caminho sempre no sentido
+    origem -> destino, ou None para alvos inalcançáveis. Sem `grid`, usa o mundo
+    instalado no processo trabalhador por _inicializar.
+    """
+    grid = grid if grid is not None else _mundo
+    costs, parents = etapa4.multi_source_dijkstra(grid, [raiz], alvos, reverse=reverso)
+    resultados = {}
+    for alvo in alvos:
+        if alvo not in costs:
+            resultados[alvo] = None
+            continue
+        path = []
+        current = alvo
+        while current is not None:
+            path.append(current)
+            current = parents[current]
+        if not reverso:
+            path.reverse()
+        resultados[alvo] = (costs[alvo], path)
+    return resultados
+
+class Pedido:
+    def __init__(self, origem, destino, futuro):
+        self.origem = origem
+        self.destino = destino
+        self.futuro = futuro
+        self.inicio = time.perf_counter()
+
+class ServicoPlanejamento:
+    """
+    Serviço assíncrono de consultas de caminho sobre um único mundo.
+
+    As consultas entram numa fila e são agrupadas em lotes por uma janela curta
+    de tempo. Consultas com a mesma origem viram uma única busca com vários
+    alvos; as restantes com o mesmo destino viram uma busca reversa a partir
+    dele. As buscas rodam num pool de processos que recebe o mundo uma só vez.
+    As estatísticas de latência usam só as `max_latencias` consultas mais recentes.
+    """
+    def __init__(self, world, trabalhadores=None, janela_s=0.002, max_lote=64, processos=True,
+                 max_latencias=10000):
+        self.world = world
+        self.trabalhadores = trabalhadores or os.cpu_count()
+        self.janela_s = janela_s
+        self.max_lote = max_lote
+        self.processos = processos
+        self.latencias = deque(maxlen=max_latencias)
+        self.consultas = 0
+        self.buscas = 0
+        self._fila = None
+        self._executor = None
+        self._agrupador = None
+        self._tarefas = set()
+        self._inicio = None
+        self._fim = None
+        self._encerrando = False
+
+    async def __aenter__(self):
+        self.iniciar()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.encerrar()
+
+    def iniciar(self):
+        if self.processos:
+            self._executor = ProcessPoolExecutor(self.trabalhadores, initializer=_inicializar,
+                                                 initargs=(self.world,))
+        else:
+            self._executor = ThreadPoolExecutor(self.trabalhadores)
+        self._encerrando = False
+        self._fila = asyncio.Queue()
+        self._agrupador = asyncio.create_task(self._agrupar())
+
+    async def encerrar(self):
+        """
+        Para de aceitar consultas, responde as que já estão na fila ou na janela
+        de agrupamento e só então desliga o pool.
+        """
+        self._encerrando = True
+        self._fila.put_nowait(_FIM)
+        try:
+            await self._agrupador
+            while self._tarefas:
+                await asyncio.gather(*self._tarefas, return_exceptions=True)
+        finally:
+            self._executor.shutdown()
+
+    async def planejar(self, origem, destino):
+        """
+        Consulta o caminho de menor custo de `origem` até `destino`.
+        Retorna (custo, caminho) ou None se não houver caminho.
+        """
+        if self._encerrando:
+            raise RuntimeError("O serviço de planejamento foi encerrado.")
+        for posicao in (origem, destino):
+            if not etapa4.is_position(posicao):
+                raise ValueError(f"Posição inválida: {posicao!r}. Use (x, y) com inteiros.")
+        futuro = asyncio.get_running_loop().create_future()
+        pedido = Pedido(origem, destino, futuro)
+        if self._inicio is None:
+            self._inicio = pedido.inicio
+        self._fila.put_nowait(pedido)
+        return await futuro
+
+    async def _agrupar(self):
+        loop = asyncio.get_running_loop()
+        fim = False
+        while not fim:
+            lote = []
+            pedido = await self._fila.get()
+            prazo = loop.time() + self.janela_s
+            while pedido is not _FIM:
+                lote.append(pedido)
+                restante = prazo - loop.time()
+                if len(lote) >= self.max_lote or restante <= 0:
+                    break
+                try:
+                    pedido = await asyncio.wait_for(self._fila.get(), restante)
+                except asyncio.TimeoutError:
+                    break
+            # A marca de fim vem depois de todas as consultas aceitas, então o
+            # último lote ainda é despachado normalmente.
+            fim = pedido is _FIM
+
+            try:
+                for raiz, reverso, pedidos in self._dividir(lote):
+                    tarefa = asyncio.create_task(self._executar(raiz, reverso, pedidos))
+                    self._tarefas.add(tarefa)
+                    tarefa.add_done_callback(self._tarefas.discard)
+            except Exception as erro:
+                # Um lote com problema falha só as suas consultas; o agrupador
+                # continua atendendo a fila. O traceback é descartado porque
+                # aponta para o quadro ativo deste laço, e um cliente que o
+                # limpasse (traceback.clear_frames) encerraria o agrupador.
+                erro = erro.with_traceback(None)
+                for pedido in lote:
+                    if not pedido.futuro.done():
+                        pedido.futuro.set_exception(erro)
+
+    def _dividir(self, lote):
+        """Agrupa o lote primeiro por origem e depois, entre as avulsas, por destino."""
+        por_origem = defaultdict(list)
+        for pedido in lote:
+            por_origem[pedido.origem].append(pedido)
+
+        grupos = []
+        avulsos = defaultdict(list)
+        for origem, pedidos in por_origem.items():
+            if len(pedidos) > 1:
+                grupos.append((origem, False, pedidos))
+            else:
+                avulsos[pedidos[0].destino].append(pedidos[0])
+
+        for destino, pedidos in avulsos.items():
+            if len(pedidos) > 1:
+                grupos.append((destino, True, pedidos))
+            else:
+                grupos.append((pedidos[0].origem, False, pedidos))
+        return grupos
+
+    async def _executar(self, raiz, reverso, pedidos):
+        alvos = {p.origem if reverso else p.destino for p in pedidos}
+        self.buscas += 1
+        grid = None if self.processos else self.world
+        loop = asyncio.get_running_loop()
+        try:
+            resultados = await loop.run_in_executor(self._executor, _resolver_lote, raiz, alvos, reverso, grid)
+        except Exception as erro:
+            for pedido in pedidos:
+                if not pedido.futuro.done():
+                    pedido.futuro.set_exception(erro)
+            return
+
+        agora = time.perf_counter()
+        for pedido in pedidos:
+            # Clientes que desistiram (futuro cancelado) não entram nas estatísticas.
+            if pedido.futuro.done():
+                continue
+            pedido.futuro.set_result(resultados[pedido.origem if reverso else pedido.destino])
+            self.latencias.append(agora - pedido.inicio)
+            self.consultas += 1
+        self._fim = agora
+
+    def estatisticas(self):
+        """
+        Latência p50/p99 das consultas mais recentes e vazão de todas as
+        consultas respondidas até agora.
+        """
+        latencias = sorted(self.latencias)
+        if not latencias:
+            return {'consultas': 0, 'buscas': self.buscas}
+
+        def percentil(p):
+            return latencias[max(math.ceil(p / 100 * len(latencias)) - 1, 0)]
+
+        duracao = self._fim - self._inicio
+        return {
+            'consultas': self.consultas,
+            'buscas': self.buscas,
+            'p50_ms': percentil(50) * 1000,
+            'p99_ms': percentil(99) * 1000,
+            'vazao_por_s': self.consultas / duracao if duracao > 0 else float('inf'),
+        }
+
+async def simular_clientes(servico, consultas):
+    """Cliente local: cada lista de `consultas` é um cliente fazendo pedidos em sequência."""
+    async def cliente(pedidos):
+        return [await servico.planejar(origem, destino) for origem, destino in pedidos]
+    return await asyncio.gather(*(cliente(pedidos) for pedidos in consultas))
+
+if __name__ == "__main__":
+    grid_size = 48
+    num_obstacles = 300
+    num_clientes = 32
+    consultas_por_cliente = 10
+    num_pontos_recarga = 4
+
+    random.seed(0)
+    obstacles = etapa4.generate_obstacles(grid_size, num_obstacles)
+    world = etapa4.GridWorldWithCosts(grid_size, obstacles)
+    pontos_recarga = [etapa4.generate_initial_position(grid_size, obstacles) for _ in range(num_pontos_recarga)]
+    consultas = [
+        [(etapa4.generate_initial_position(grid_size, obstacles), random.choice(pontos_recarga))
+         for _ in range(consultas_por_cliente)]
+        for _ in range(num_clientes)
+    ]
+
+    async def main():
+        async with ServicoPlanejamento(world) as servico:
+            respostas = await simular_clientes(servico, consultas)
+        return servico, respostas
+
+    servico, respostas = asyncio.run(main())
+    stats = servico.estatisticas()
+
+    inicio = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for pedidos in consultas:
+            for origem, destino in pedidos:
+                etapa4.DijkstraAgent(origem, destino, world)
+    tempo_sequencial = time.perf_counter() - inicio
+
+    encontrados = sum(1 for cliente in respostas for r in cliente if r is not None)
+
+    print("\n=== MÉTRICAS ===")
+    print(f"Consultas respondidas: {stats['consultas']} ({encontrados} com caminho)")
+    print(f"Buscas executadas: {stats['buscas']}")
+    print(f"Latência p50: {stats['p50_ms']:.2f} ms")
+    print(f"Latência p99: {stats['p99_ms']:.2f} ms")
+    print(f"Vazão: {stats['vazao_por_s']:.1f} consultas/s")
+    print(f"Vazão sequencial com DijkstraAgent: {stats['consultas'] / tempo_sequencial:.1f} consultas/s")
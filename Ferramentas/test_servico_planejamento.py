@@ -0,0 +1,72 @@
+import asyncio
+import unittest
+
+import servico_planejamento as sp
+
+def mundo_aberto(n=5):
+    """Grid sem obstáculos e com custo 1 em todas as células."""
+    world = sp.etapa4.GridWorldWithCosts(n, set())
+    world.terrain = {pos: 1 for pos in world.terrain}
+    return world
+
+class TestServicoPlanejamento(unittest.TestCase):
+    def rodar(self, corrotina):
+        return asyncio.run(asyncio.wait_for(corrotina, 10))
+
+    def test_consulta_invalida_nao_afeta_as_demais(self):
+        async def main():
+            servico = sp.ServicoPlanejamento(mundo_aberto(), processos=False, janela_s=0.05)
+            servico.iniciar()
+            tarefas = [
+                asyncio.create_task(servico.planejar((0, 0), (4, 0))),
+                asyncio.create_task(servico.planejar([0, 0], (4, 4))),
+                asyncio.create_task(servico.planejar(('a', 'b'), (4, 4))),
+                asyncio.create_task(servico.planejar((0, 0), (4, 4))),
+            ]
+            resultados = await asyncio.gather(*tarefas, return_exceptions=True)
+            depois = await servico.planejar((1, 1), (1, 3))
+            await servico.encerrar()
+            return resultados, depois
+
+        resultados, depois = self.rodar(main())
+        self.assertEqual(resultados[0][0], 4)
+        self.assertIsInstance(resultados[1], ValueError)
+        self.assertIsInstance(resultados[2], ValueError)
+        self.assertEqual(resultados[3][0], 8)
+        self.assertEqual(depois[0], 2)
+
+    def test_erro_no_agrupamento_falha_so_o_lote(self):
+        async def main():
+            servico = sp.ServicoPlanejamento(mundo_aberto(), processos=False)
+            dividir = servico._dividir
+            falhas = []
+
+            def dividir_com_falha(lote):
+                if not falhas:
+                    falhas.append(lote)
+                    raise RuntimeError("falha no agrupamento")
+                return dividir(lote)
+
+            servico._dividir = dividir_com_falha
+            servico.iniciar()
+            with self.assertRaises(RuntimeError):
+                await servico.planejar((0, 0), (4, 0))
+            resultado = await servico.planejar((0, 0), (4, 0))
+            await servico.encerrar()
+            return resultado
+
+        self.assertEqual(self.rodar(main())[0], 4)
+
+    def test_latencias_limitadas(self):
+        async def main():
+            async with sp.ServicoPlanejamento(mundo_aberto(), processos=False, max_latencias=3) as servico:
+                for x in range(5):
+                    await servico.planejar((0, 0), (x, 0))
+            return servico
+
+        servico = self.rodar(main())
+        self.assertEqual(len(servico.latencias), 3)
+        self.assertEqual(servico.estatisticas()['consultas'], 5)
+
+if __name__ == "__main__":
+    unittest.main()